@@ -0,0 +1,22 @@
+from dotenv import load_dotenv
+import os
+
+# Único punto de carga del .env para toda la aplicación
+load_dotenv()
+
+JWT_SECRET = os.getenv("JWT_SECRET")
+ALGORITHM = os.getenv("ALGORITHM", "HS256")
+ACCESS_TOKEN_EXPIRES_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRES_MINUTES", 60))
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./pathfinder.db")
+
+CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
+
+# Número de shards del modo particionado (0 = desactivado)
+GRAPH_SHARDS = int(os.getenv("GRAPH_SHARDS", 0))
+
+# Presupuesto de arranque en milisegundos (0 = sin presupuesto)
+STARTUP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_MS", 0))
+
+# Precalentar caches en segundo plano tras el arranque (0 = desactivado)
+STARTUP_WARM = os.getenv("STARTUP_WARM", "1") != "0"
@@ -1,22 +1,43 @@
 from sqlmodel import SQLModel, create_engine, Session
-from dotenv import load_dotenv
-import os
 
-load_dotenv()
+from .config import DATABASE_URL
+
+# Incrementar al cambiar los modelos para que init_db vuelva a ejecutar create_all
+SCHEMA_VERSION = 1
+
+def make_engine(database_url: str):
+    """Crea un engine; también lo usan los procesos de shard con su propia conexión"""
+    return create_engine(
+        database_url,
+        echo=False,
+        connect_args={"check_same_thread": False}
+    )
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./pathfinder.db")
 
 # Crear engine
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    connect_args={"check_same_thread": False}
-)
+engine = make_engine(DATABASE_URL)
+
 
+def init_db() -> bool:
+    """Inicializa la base de datos creando todas las tablas
 
-def init_db():
-    """Inicializa la base de datos creando todas las tablas"""
+    En SQLite la versión del esquema se guarda en PRAGMA user_version y
+    create_all se omite si ya está al día. Retorna True si se ejecutó.
+    """
+    if engine.dialect.name != "sqlite":
+        SQLModel.metadata.create_all(engine)
+        return True
+    
+    with engine.connect() as conn:
+        if conn.exec_driver_sql("PRAGMA user_version").scalar() == SCHEMA_VERSION:
+            return False
+    
     SQLModel.metadata.create_all(engine)
+    
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    return True
 
 
 def get_session():
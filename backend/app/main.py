@@ -1,24 +1,30 @@
+import time
+
+# Medición del tiempo de importación de la aplicación
+STARTED_AT = time.perf_counter()
+
+import threading
+
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session, select
-from dotenv import load_dotenv
-import os
 
+from .config import CORS_ORIGINS, GRAPH_SHARDS, STARTUP_BUDGET_MS, STARTUP_WARM
 from .db import init_db, get_session
 from .models import User
-from .schemas import UserCreate, UserResponse, Token
-from .auth import get_password_hash, verify_password, create_access_token
+from .schemas import UserCreate, UserResponse, Token, StartupStatsResponse
+from .auth import get_password_hash, verify_password, create_access_token, get_pwd_context
 from .deps import get_current_user
 from .routes import graph, algorithms
 
-load_dotenv()
+IMPORT_MS = (time.perf_counter() - STARTED_AT) * 1000
+
+startup_stats = StartupStatsResponse(import_ms=IMPORT_MS, budget_ms=STARTUP_BUDGET_MS)
 
 app = FastAPI(title="PathFinder API", version="1.0.0")
 
 # CORS
-CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
-
 app.add_middleware(
     CORSMiddleware,
     allow_origins=CORS_ORIGINS,
@@ -28,11 +34,54 @@ app.add_middleware(
 )
 
 
+def warm_caches():
+    """Precalienta en segundo plano lo que se difirió durante el arranque"""
+    started = time.perf_counter()
+    
+    try:
+        # Carga passlib/bcrypt y python-jose
+        get_pwd_context().hash("warmup")
+        create_access_token(data={"sub": "warmup"})
+        
+        if GRAPH_SHARDS > 1:
+            from .partition import get_partitioned_graph
+            get_partitioned_graph()
+    except Exception as exc:
+        startup_stats.warm_error = repr(exc)
+        print(f"⚠️  Cache warm-up failed: {exc!r}")
+        return
+    
+    startup_stats.warm_ms = (time.perf_counter() - started) * 1000
+    print(f"🔥 Caches warmed in {startup_stats.warm_ms:.0f} ms")
+
+
 # Inicializar DB al arrancar
 @app.on_event("startup")
 def on_startup():
-    init_db()
-    print("✅ Database initialized")
+    # app.partition (y multiprocessing) solo se importa en modo particionado
+    if GRAPH_SHARDS > 1:
+        from .partition import open_partitions
+        open_partitions()
+    
+    startup_stats.schema_created = init_db()
+    print("✅ Database initialized" if startup_stats.schema_created else "✅ Database schema up to date")
+    
+    startup_stats.startup_ms = (time.perf_counter() - STARTED_AT) * 1000
+    print(f"⏱️  Startup in {startup_stats.startup_ms:.0f} ms (imports {IMPORT_MS:.0f} ms)")
+    
+    if STARTUP_BUDGET_MS and startup_stats.startup_ms > STARTUP_BUDGET_MS:
+        print(f"⚠️  Startup exceeded budget of {STARTUP_BUDGET_MS:.0f} ms")
+    
+    # El servidor empieza a aceptar tráfico mientras se calientan las caches
+    if STARTUP_WARM:
+        threading.Thread(target=warm_caches, daemon=True).start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    if GRAPH_SHARDS > 1:
+        from .partition import close_partitions
+        close_partitions()
 
 
 # ========== AUTH ROUTES ==========
@@ -89,6 +138,12 @@ app.include_router(graph.router, prefix="/graph", tags=["graph"])
 app.include_router(algorithms.router, prefix="/graph", tags=["algorithms"])
 
 
+@app.get("/stats/startup", response_model=StartupStatsResponse)
+def get_startup_stats(current_user: User = Depends(get_current_user)):
+    """Tiempos de importación, arranque y precalentamiento del proceso"""
+    return startup_stats
+
+
 @app.get("/")
 def root():
     return {"message": "PathFinder API - Use /docs for documentation"}
\ No newline at end of file
@@ -0,0 +1,542 @@
+"""
+Modo particionado del grafo
+
+Los nodos se reparten en shards por rangos contiguos de id, cada uno servido
+por su propio proceso que carga de la base de datos solo las aristas que
+tocan su rango. Las aristas de corte (entre shards) y los atajos intra-shard
+de nodos de entrada a nodos de salida forman un grafo overlay. El
+coordinador solo guarda los límites de los rangos y los pesos del overlay;
+los caminos de los atajos viven en cada shard y se expanden al final de la
+consulta.
+"""
+import heapq
+import multiprocessing as mp
+import threading
+from bisect import bisect_right
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlmodel import Session, select
+
+from .config import DATABASE_URL, GRAPH_SHARDS
+from .db import make_engine
+from .models import Node, Edge
+
+# (dst_id, weight) por nodo origen
+Adjacency = Dict[int, List[Tuple[int, float]]]
+
+# Filas leídas por lote al recorrer la tabla de aristas
+STREAM_BATCH = 10000
+
+
+class ShardUnavailable(Exception):
+    """Un shard no pudo cargarse, su proceso terminó o el modo particionado está cerrado"""
+
+
+def dijkstra(graph: Adjacency, source: int, targets: Set[int]) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """Dijkstra desde source hasta alcanzar todos los objetivos
+
+    Retorna las distancias de los nodos fijados y el mapa de predecesores.
+    """
+    dist = {source: 0.0}
+    prev = {}
+    pq = [(0.0, source)]
+    settled = {}
+    pending = set(targets)
+
+    while pq and pending:
+        current_dist, current_node = heapq.heappop(pq)
+
+        if current_node in settled:
+            continue
+
+        settled[current_node] = current_dist
+        pending.discard(current_node)
+
+        for neighbor, weight in graph.get(current_node, []):
+            if neighbor in settled:
+                continue
+
+            new_dist = current_dist + weight
+
+            if neighbor not in dist or new_dist < dist[neighbor]:
+                dist[neighbor] = new_dist
+                prev[neighbor] = current_node
+                heapq.heappush(pq, (new_dist, neighbor))
+
+    return settled, prev
+
+
+def build_path(prev: Dict[int, int], target: int) -> List[int]:
+    """Reconstruye el camino desde el origen de la búsqueda hasta target"""
+    path = []
+    current = target
+    while current is not None:
+        path.append(current)
+        current = prev.get(current)
+    path.reverse()
+    return path
+
+
+def partition_bounds(session: Session, num_shards: int) -> List[int]:
+    """Calcula los ids donde empieza cada shard a partir del segundo
+
+    Los shards son rangos contiguos de id con el mismo número de nodos. Solo
+    se consultan num_shards - 1 ids, sin leer nodos ni aristas completos.
+    Con menos nodos que shards algunos rangos quedan vacíos.
+    """
+    count = session.exec(select(func.count(Node.id))).one()
+    if count == 0:
+        return [0] * (num_shards - 1)
+
+    statement = select(Node.id).order_by(Node.id)
+    return [
+        session.exec(statement.offset(shard * count // num_shards).limit(1)).one()
+        for shard in range(1, num_shards)
+    ]
+
+
+def shard_range(bounds: List[int], shard: int) -> Tuple[Optional[int], Optional[int]]:
+    """Rango [lo, hi) de ids del shard; None indica un extremo abierto"""
+    lo = bounds[shard - 1] if shard > 0 else None
+    hi = bounds[shard] if shard < len(bounds) else None
+    return lo, hi
+
+
+def _shard_worker(conn, database_url: str, lo: Optional[int], hi: Optional[int]):
+    """Proceso de un shard
+
+    Carga de la base de datos solo las aristas que tocan su rango de ids,
+    calcula los atajos de sus nodos de entrada a sus nodos de salida y
+    atiende búsquedas locales.
+    """
+    def member(node_id: int) -> bool:
+        return (lo is None or node_id >= lo) and (hi is None or node_id < hi)
+
+    def in_range(column):
+        conditions = []
+        if lo is not None:
+            conditions.append(column >= lo)
+        if hi is not None:
+            conditions.append(column < hi)
+        return and_(*conditions)
+
+    forward: Adjacency = {}
+    backward: Adjacency = {}
+    # Entradas: destino de una arista de corte. Salidas: origen de una arista de corte.
+    entries: Set[int] = set()
+    exits: Set[int] = set()
+    cut_edges = []
+
+    try:
+        engine = make_engine(database_url)
+        statement = select(Edge.src_id, Edge.dst_id, Edge.weight)
+        if lo is not None or hi is not None:
+            # Los índices de src_id y dst_id evitan recorrer toda la tabla
+            statement = statement.where(or_(in_range(Edge.src_id), in_range(Edge.dst_id)))
+
+        with Session(engine) as session:
+            for src, dst, weight in session.exec(statement.execution_options(yield_per=STREAM_BATCH)):
+                src_in, dst_in = member(src), member(dst)
+                if src_in and dst_in:
+                    forward.setdefault(src, []).append((dst, weight))
+                    backward.setdefault(dst, []).append((src, weight))
+                elif src_in:
+                    exits.add(src)
+                    cut_edges.append((src, dst, weight))
+                elif dst_in:
+                    entries.add(dst)
+        engine.dispose()
+
+        # Atajos entrada -> salida; el camino se guarda aquí y al coordinador solo va el peso
+        shortcuts: Dict[Tuple[int, int], List[int]] = {}
+        overlay_edges = list(cut_edges)
+        for entry in entries:
+            settled, prev = dijkstra(forward, entry, exits)
+            for exit_node in exits:
+                if exit_node != entry and exit_node in settled:
+                    shortcuts[(entry, exit_node)] = build_path(prev, exit_node)
+                    overlay_edges.append((entry, exit_node, settled[exit_node]))
+    except Exception as exc:
+        conn.send(("error", repr(exc)))
+        conn.close()
+        return
+
+    conn.send(("ready", len(entries), len(exits), overlay_edges))
+    del cut_edges, overlay_edges
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+
+        results = []
+        for op in message:
+            if op[0] == "search":
+                # Hacia adelante: distancias a las salidas; con reverse: desde las entradas
+                _, source, reverse, extra = op
+                targets = (entries if reverse else exits) | extra
+                settled, _ = dijkstra(backward if reverse else forward, source, targets)
+                results.append({n: settled[n] for n in targets if n in settled})
+            else:
+                # Camino interno del shard entre dos nodos
+                _, a, b = op
+                path = shortcuts.get((a, b))
+                if path is None:
+                    _, prev = dijkstra(forward, a, {b})
+                    path = build_path(prev, b)
+                results.append(path)
+        conn.send(results)
+
+    conn.close()
+
+
+class PartitionedGraph:
+    """Coordinador de shards y del grafo overlay
+
+    Solo mantiene los límites de los rangos de id y los pesos del overlay.
+    Cada shard tiene su propio lock, así que consultas sobre shards
+    distintos se ejecutan en paralelo.
+    """
+
+    def __init__(self, database_url: str, num_shards: int):
+        self.num_shards = num_shards
+        self.generation = 0
+        self._closed = False
+
+        engine = make_engine(database_url)
+        with Session(engine) as session:
+            self.bounds = partition_bounds(session, num_shards)
+        engine.dispose()
+
+        # Un proceso por shard, comunicado por un Pipe
+        self._conns = []
+        self._procs = []
+        self._locks = [threading.Lock() for _ in range(num_shards)]
+        # spawn evita heredar hilos y conexiones abiertas del servidor
+        ctx = mp.get_context("spawn")
+        for shard in range(num_shards):
+            lo, hi = shard_range(self.bounds, shard)
+            parent_conn, child_conn = ctx.Pipe()
+            proc = ctx.Process(target=_shard_worker, args=(child_conn, database_url, lo, hi), daemon=True)
+            proc.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._procs.append(proc)
+
+        # Overlay con pesos: aristas de corte + atajos reportados por cada shard
+        self.overlay: Adjacency = {}
+        self.entry_sizes: List[int] = []
+        self.exit_sizes: List[int] = []
+        try:
+            for shard, conn in enumerate(self._conns):
+                try:
+                    reply = conn.recv()
+                except (EOFError, OSError) as exc:
+                    raise ShardUnavailable(f"Shard {shard} failed to load: {exc!r}") from exc
+                if reply[0] == "error":
+                    raise ShardUnavailable(f"Shard {shard} failed to load: {reply[1]}")
+                _, entry_size, exit_size, overlay_edges = reply
+                self.entry_sizes.append(entry_size)
+                self.exit_sizes.append(exit_size)
+                for src, dst, weight in overlay_edges:
+                    self.overlay.setdefault(src, []).append((dst, weight))
+        except BaseException:
+            self.close()
+            raise
+
+    def shard_of(self, node_id: int) -> int:
+        """Shard al que pertenece un nodo según los límites de los rangos"""
+        return bisect_right(self.bounds, node_id)
+
+    def _scatter(self, messages: Dict[int, list]) -> Dict[int, list]:
+        """Envía un lote de operaciones a cada shard y recoge las respuestas
+
+        Los locks se toman en orden de shard para evitar bloqueos cruzados.
+        """
+        shards = sorted(messages)
+        for shard in shards:
+            self._locks[shard].acquire()
+        try:
+            if self._closed:
+                raise ShardUnavailable("Partitioned graph is closed")
+            try:
+                for shard in shards:
+                    self._conns[shard].send(messages[shard])
+                return {shard: self._conns[shard].recv() for shard in shards}
+            except (EOFError, OSError) as exc:
+                raise ShardUnavailable(f"Shard process unavailable: {exc!r}") from exc
+        finally:
+            for shard in reversed(shards):
+                self._locks[shard].release()
+
+    def shortest_path(self, src_id: int, dst_id: int) -> Optional[Tuple[List[int], float]]:
+        """Camino mínimo combinando búsquedas por shard con el overlay"""
+        if src_id == dst_id:
+            return [src_id], 0.0
+
+        src_shard = self.shard_of(src_id)
+        dst_shard = self.shard_of(dst_id)
+
+        if src_shard == dst_shard:
+            replies = self._scatter({src_shard: [
+                ("search", src_id, False, {dst_id}),
+                ("search", dst_id, True, set()),
+            ]})
+            start, end = replies[src_shard]
+        else:
+            replies = self._scatter({
+                src_shard: [("search", src_id, False, set())],
+                dst_shard: [("search", dst_id, True, set())],
+            })
+            start, end = replies[src_shard][0], replies[dst_shard][0]
+
+        best = start.pop(dst_id, None)
+        best_node = None
+
+        # Dijkstra sobre el overlay con fuente múltiple (salidas alcanzadas desde el origen)
+        dist = dict(start)
+        prev: Dict[int, Optional[int]] = {b: None for b in start}
+        pq = [(d, b) for b, d in dist.items()]
+        heapq.heapify(pq)
+        visited = set()
+
+        while pq:
+            current_dist, current_node = heapq.heappop(pq)
+
+            if best is not None and current_dist >= best:
+                break
+
+            if current_node in visited:
+                continue
+
+            visited.add(current_node)
+
+            if current_node in end:
+                candidate = current_dist + end[current_node]
+                if best is None or candidate < best:
+                    best = candidate
+                    best_node = current_node
+
+            for neighbor, weight in self.overlay.get(current_node, []):
+                if neighbor in visited:
+                    continue
+
+                new_dist = current_dist + weight
+
+                if neighbor not in dist or new_dist < dist[neighbor]:
+                    dist[neighbor] = new_dist
+                    prev[neighbor] = current_node
+                    heapq.heappush(pq, (new_dist, neighbor))
+
+        if best is None:
+            return None
+
+        if best_node is None:
+            return self._expand([(src_id, dst_id)]), best
+
+        # Secuencia de nodos del overlay, luego tramos a expandir dentro de cada shard
+        hops = []
+        current = best_node
+        while current is not None:
+            hops.append(current)
+            current = prev[current]
+        hops.reverse()
+
+        legs = [(src_id, hops[0])] + list(zip(hops, hops[1:])) + [(hops[-1], dst_id)]
+        return self._expand(legs), best
+
+    def _expand(self, legs: List[Tuple[int, int]]) -> List[int]:
+        """Expande los tramos del camino; las aristas de corte no necesitan shard"""
+        messages: Dict[int, list] = {}
+        for a, b in legs:
+            if self.shard_of(a) == self.shard_of(b):
+                messages.setdefault(self.shard_of(a), []).append(("path", a, b))
+
+        replies = {shard: deque(paths) for shard, paths in self._scatter(messages).items()} if messages else {}
+
+        path = [legs[0][0]]
+        for a, b in legs:
+            if self.shard_of(a) == self.shard_of(b):
+                path.extend(replies[self.shard_of(a)].popleft()[1:])
+            else:
+                path.append(b)
+
+        return path
+
+    def close(self):
+        """Detiene los procesos de los shards tras las consultas en curso"""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            if self._closed:
+                return
+            self._closed = True
+            for conn in self._conns:
+                try:
+                    conn.send(None)
+                    conn.close()
+                except OSError:
+                    pass
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+        for proc in self._procs:
+            proc.join(timeout=1)
+            if proc.is_alive():
+                proc.terminate()
+
+
+# Grafo activo. Cada escritura incrementa _generation; las consultas solo
+# usan un grafo construido en la generación actual, así que un cliente
+# siempre ve sus propios cambios.
+_active: Optional[PartitionedGraph] = None
+_active_lock = threading.Lock()
+_build_lock = threading.Lock()
+_generation = 0
+_rebuilding = False
+_shutdown = False
+
+
+def _close_in_background(graph: PartitionedGraph):
+    """Cierra un grafo sin bloquear al llamador"""
+    threading.Thread(target=graph.close, daemon=True).start()
+
+
+def _current_graph() -> Optional[PartitionedGraph]:
+    """Grafo activo si está al día con la última escritura"""
+    with _active_lock:
+        if _active is not None and _active.generation == _generation:
+            return _active
+    return None
+
+
+def _build_current() -> PartitionedGraph:
+    """Construye y activa el grafo de la generación actual si hace falta"""
+    global _active
+
+    with _build_lock:
+        graph = _current_graph()
+        if graph is not None:
+            return graph
+
+        if _shutdown:
+            raise ShardUnavailable("Partitioned mode is shut down")
+
+        with _active_lock:
+            generation = _generation
+        graph = PartitionedGraph(DATABASE_URL, GRAPH_SHARDS)
+        graph.generation = generation
+
+        with _active_lock:
+            if _shutdown:
+                old = graph
+            else:
+                old, _active = _active, graph
+        if old is not None:
+            _close_in_background(old)
+
+    return graph
+
+
+def _rebuild_in_background():
+    """Adelanta la reconstrucción tras una escritura
+
+    Si falla se descarta el grafo activo; la siguiente consulta reintenta
+    la construcción.
+    """
+    global _active, _rebuilding
+
+    try:
+        while True:
+            with _active_lock:
+                generation = _generation
+            _build_current()
+            with _active_lock:
+                if generation == _generation:
+                    return
+    except Exception as exc:
+        if not _shutdown:
+            print(f"⚠️  Partitioned graph rebuild failed: {exc!r}")
+        with _active_lock:
+            old, _active = _active, None
+        if old is not None:
+            _close_in_background(old)
+    finally:
+        with _active_lock:
+            _rebuilding = False
+
+
+def get_partitioned_graph() -> PartitionedGraph:
+    """Retorna el grafo particionado al día, esperando o construyéndolo si hace falta"""
+    if _shutdown:
+        raise ShardUnavailable("Partitioned mode is shut down")
+
+    graph = _current_graph()
+    if graph is not None:
+        return graph
+
+    return _build_current()
+
+
+def partitioned_shortest_path(src_id: int, dst_id: int) -> Optional[Tuple[List[int], float]]:
+    """Camino mínimo en modo particionado
+
+    Si un shard dejó de responder se descarta el grafo y se reintenta una
+    vez con uno reconstruido.
+    """
+    global _active
+
+    for attempt in range(2):
+        graph = get_partitioned_graph()
+        try:
+            return graph.shortest_path(src_id, dst_id)
+        except ShardUnavailable:
+            with _active_lock:
+                if _active is graph:
+                    _active = None
+            _close_in_background(graph)
+            if attempt or _shutdown:
+                raise
+
+    return None
+
+
+def invalidate_partitions():
+    """Marca el grafo como desactualizado tras un cambio en nodos o aristas
+
+    No bloquea: la reconstrucción empieza en segundo plano y la siguiente
+    consulta espera a que termine.
+    """
+    global _generation, _rebuilding
+
+    with _active_lock:
+        _generation += 1
+        if _active is None or _rebuilding or _shutdown:
+            return
+        _rebuilding = True
+    threading.Thread(target=_rebuild_in_background, daemon=True).start()
+
+
+def open_partitions():
+    """Habilita el modo particionado (arranque del servidor)"""
+    global _shutdown
+
+    with _active_lock:
+        _shutdown = False
+
+
+def close_partitions():
+    """Detiene los procesos del grafo activo y descarta reconstrucciones (apagado del servidor)"""
+    global _active, _shutdown
+
+    with _active_lock:
+        _shutdown = True
+        graph, _active = _active, None
+    if graph is not None:
+        graph.close()
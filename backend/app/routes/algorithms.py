@@ -5,11 +5,16 @@ import heapq
 
 from ..db import get_session
 from ..models import Node, Edge, User
-from ..schemas import BFSResponse, BFSTreeNode, DijkstraResponse
+from ..schemas import BFSResponse, BFSTreeNode, DijkstraResponse, CoalesceStatsResponse
 from ..deps import get_current_user
+from ..singleflight import SingleFlight
+from ..config import GRAPH_SHARDS
 
 router = APIRouter()
 
+# Peticiones concurrentes idénticas comparten un único cómputo
+inflight = SingleFlight()
+
 
 @router.get("/bfs", response_model=BFSResponse)
 def bfs_traversal(
@@ -26,6 +31,11 @@ def bfs_traversal(
             detail=f"Node with id {start_id} not found"
         )
     
+    return inflight.do(("bfs", start_id), lambda: _run_bfs(session, start_id))
+
+
+def _run_bfs(session: Session, start_id: int) -> BFSResponse:
+    """Carga las aristas y ejecuta BFS desde start_id"""
     # Obtener todas las aristas
     statement = select(Edge)
     edges = session.exec(statement).all()
@@ -96,6 +106,37 @@ def dijkstra_shortest_path(
             detail=f"Destination node with id {dst_id} not found"
         )
     
+    run = _run_partitioned_dijkstra if GRAPH_SHARDS > 1 else _run_dijkstra
+    return inflight.do(
+        ("shortest-path", src_id, dst_id),
+        lambda: run(session, src_id, dst_id)
+    )
+
+
+def _run_partitioned_dijkstra(session: Session, src_id: int, dst_id: int) -> DijkstraResponse:
+    """Camino mínimo en modo particionado (shards + overlay de aristas de corte y atajos)"""
+    from ..partition import partitioned_shortest_path, ShardUnavailable
+    
+    try:
+        result = partitioned_shortest_path(src_id, dst_id)
+    except ShardUnavailable as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Partitioned graph unavailable: {exc}"
+        )
+    
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No path found between nodes {src_id} and {dst_id}"
+        )
+    
+    path, distance = result
+    return DijkstraResponse(path=path, distance=distance)
+
+
+def _run_dijkstra(session: Session, src_id: int, dst_id: int) -> DijkstraResponse:
+    """Carga las aristas y ejecuta Dijkstra entre src_id y dst_id"""
     # Obtener todas las aristas
     statement = select(Edge)
     edges = session.exec(statement).all()
@@ -151,4 +192,10 @@ def dijkstra_shortest_path(
     
     path.reverse()
     
-    return DijkstraResponse(path=path, distance=dist[dst_id])
\ No newline at end of file
+    return DijkstraResponse(path=path, distance=dist[dst_id])
+
+
+@router.get("/stats/coalesced", response_model=CoalesceStatsResponse)
+def coalesced_stats(current_user: User = Depends(get_current_user)):
+    """Contador de peticiones BFS/Dijkstra agrupadas en un cómputo en curso"""
+    return CoalesceStatsResponse(**inflight.stats())
\ No newline at end of file
@@ -6,10 +6,18 @@ from ..db import get_session
 from ..models import Node, Edge, User
 from ..schemas import NodeCreate, NodeResponse, EdgeCreate, EdgeResponse
 from ..deps import get_current_user
+from ..config import GRAPH_SHARDS
 
 router = APIRouter()
 
 
+def invalidate_partitions():
+    """Marca el grafo particionado como desactualizado (solo en modo particionado)"""
+    if GRAPH_SHARDS > 1:
+        from ..partition import invalidate_partitions as invalidate
+        invalidate()
+
+
 # ========== NODES ==========
 @router.post("/nodes", response_model=NodeResponse, status_code=status.HTTP_201_CREATED)
 def create_node(
@@ -30,6 +38,7 @@ def create_node(
     node = Node(name=node_data.name)
     session.add(node)
     session.commit()
+    invalidate_partitions()
     session.refresh(node)
     
     return NodeResponse(id=node.id, name=node.name) # type: ignore
@@ -72,6 +81,7 @@ def delete_node(
     # Eliminar nodo
     session.delete(node)
     session.commit()
+    invalidate_partitions()
 
 
 # ========== EDGES ==========
@@ -113,6 +123,7 @@ def create_edge(
     
     session.add(edge)
     session.commit()
+    invalidate_partitions()
     session.refresh(edge)
     
     return EdgeResponse(
@@ -153,4 +164,5 @@ def delete_edge(
         )
     
     session.delete(edge)
-    session.commit()
\ No newline at end of file
+    session.commit()
+    invalidate_partitions()
\ No newline at end of file
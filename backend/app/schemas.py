@@ -59,4 +59,19 @@ class BFSResponse(BaseModel):
 
 class DijkstraResponse(BaseModel):
     path: List[int]
-    distance: float
\ No newline at end of file
+    distance: float
+
+
+# ========== STATS SCHEMAS ==========
+class CoalesceStatsResponse(BaseModel):
+    coalesced: int
+    in_flight: int
+
+
+class StartupStatsResponse(BaseModel):
+    import_ms: float
+    startup_ms: Optional[float] = None
+    schema_created: Optional[bool] = None
+    budget_ms: float = 0
+    warm_ms: Optional[float] = None
+    warm_error: Optional[str] = None
\ No newline at end of file
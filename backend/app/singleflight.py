@@ -0,0 +1,55 @@
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """Cómputo en curso compartido por todas las peticiones con la misma clave"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None # type: ignore
+
+
+class SingleFlight:
+    """Agrupa peticiones concurrentes idénticas en un único cómputo"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Ejecuta fn una sola vez por clave; las peticiones concurrentes esperan y comparten el resultado"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def stats(self) -> dict:
+        """Retorna el contador de peticiones agrupadas y los cómputos en curso"""
+        with self._lock:
+            return {"coalesced": self.coalesced, "in_flight": len(self._calls)}
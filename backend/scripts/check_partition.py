@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Verificación local del modo particionado
+Levanta varios procesos de shard y compara cada camino mínimo con
+Dijkstra en un solo proceso, sobre la base de datos y un grafo aleatorio
+"""
+import sys
+import random
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+# Agregar el directorio parent al path para importar app
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import SQLModel, Session, select
+from app.config import DATABASE_URL
+from app.db import make_engine
+from app.models import Node, Edge
+from app.partition import PartitionedGraph, dijkstra
+
+
+def write_random_graph(database_url: str, num_nodes: int, num_edges: int, seed: int):
+    """Guarda un grafo dirigido aleatorio con pesos positivos en una base de datos nueva"""
+    rng = random.Random(seed)
+    engine = make_engine(database_url)
+    SQLModel.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        for i in range(1, num_nodes + 1):
+            session.add(Node(id=i, name=f"n{i}"))
+        for _ in range(num_edges):
+            src, dst = rng.randint(1, num_nodes), rng.randint(1, num_nodes)
+            if src != dst:
+                session.add(Edge(src_id=src, dst_id=dst, weight=round(rng.uniform(1, 100), 1)))
+        session.commit()
+
+    engine.dispose()
+
+
+def load_graph(database_url: str):
+    """Lee nodos y aristas para la referencia sin particionar"""
+    engine = make_engine(database_url)
+    with Session(engine) as session:
+        node_ids = list(session.exec(select(Node.id)).all())
+        graph = {}
+        for e in session.exec(select(Edge)).all():
+            graph.setdefault(e.src_id, []).append((e.dst_id, e.weight))
+    engine.dispose()
+    return node_ids, graph
+
+
+def check(name: str, database_url: str, shards: int) -> bool:
+    """Compara todas las parejas origen-destino contra Dijkstra sin particionar"""
+    node_ids, graph = load_graph(database_url)
+
+    partitioned = PartitionedGraph(database_url, shards)
+    overlay = sum(len(edges) for edges in partitioned.overlay.values())
+    print(
+        f"📊 {name}: {len(node_ids)} nodos, {shards} shards, "
+        f"{sum(partitioned.entry_sizes)} entradas, {sum(partitioned.exit_sizes)} salidas, "
+        f"{overlay} aristas en el overlay"
+    )
+
+    failures = []
+
+    def run(sources):
+        for src in sources:
+            expected, _ = dijkstra(graph, src, set(node_ids))
+            for dst in node_ids:
+                result = partitioned.shortest_path(src, dst)
+                if dst not in expected:
+                    ok = result is None
+                else:
+                    ok = result is not None and abs(result[1] - expected[dst]) < 1e-6 and valid(result[0], result[1])
+                if not ok:
+                    failures.append((src, dst, expected.get(dst), result))
+
+    def valid(path, distance):
+        """El camino expandido usa aristas reales y suma la distancia reportada"""
+        total = 0.0
+        for a, b in zip(path, path[1:]):
+            weights = [w for n, w in graph.get(a, []) if n == b]
+            if not weights:
+                return False
+            total += min(weights)
+        return abs(total - distance) < 1e-6
+
+    # Varios hilos a la vez para ejercitar los locks por shard
+    try:
+        threads = [threading.Thread(target=run, args=(node_ids[i::4],)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        partitioned.close()
+
+    for src, dst, expected, result in failures:
+        print(f"  ❌ {src} -> {dst}: esperado {expected}, obtenido {result}")
+    if not failures:
+        print(f"  ✅ {len(node_ids) ** 2} consultas coinciden")
+    return not failures
+
+
+def main():
+    """Función principal de verificación"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shards", type=int, default=3)
+    args = parser.parse_args()
+
+    ok = check("Base de datos", DATABASE_URL, args.shards)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        random_url = f"sqlite:///{tmp}/random.db"
+        write_random_graph(random_url, 120, 400, seed=7)
+        ok = check("Grafo aleatorio", random_url, args.shards) and ok
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Medición del arranque en frío de la API
+Lanza varios procesos nuevos que importan app.main y ejecutan el evento
+de startup sobre una copia temporal de la base de datos (sin precalentar
+caches), y reporta la mediana de los tiempos
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+
+PROBE = """
+import json
+import app.main as m
+m.on_startup()
+print(json.dumps(m.startup_stats.dict()))
+"""
+
+
+def measure_once() -> dict:
+    """Arranca un proceso nuevo y retorna sus tiempos de arranque"""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Copia de la DB versionada para no modificarla
+        db_copy = Path(tmp) / "pathfinder.db"
+        shutil.copy(BASE_DIR / "pathfinder.db", db_copy)
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_copy}", STARTUP_WARM="0")
+
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", PROBE],
+            cwd=BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Función principal de medición"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"🚀 Midiendo arranque en frío ({args.runs} procesos)...\n")
+
+    runs = [measure_once() for _ in range(args.runs)]
+    import_ms = statistics.median(r["import_ms"] for r in runs)
+    startup_ms = statistics.median(r["startup_ms"] for r in runs)
+    budget_ms = runs[0]["budget_ms"]
+
+    print(f"📊 Importación: {import_ms:.0f} ms (mediana)")
+    print(f"📊 Arranque:    {startup_ms:.0f} ms (mediana)")
+
+    if budget_ms and startup_ms > budget_ms:
+        print(f"❌ Supera el presupuesto de {budget_ms:.0f} ms")
+        sys.exit(1)
+
+    print("✅ Medición completada")
+
+
+if __name__ == "__main__":
+    main()